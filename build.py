@@ -22,15 +22,27 @@ import hashlib
 import re
 import argparse
 import logging
+import shelve
 import tempfile
+import time
+import threading
 import zipfile
 import plistlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Set
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -38,6 +50,17 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+# urllib3 logs every pooled request at DEBUG; keep it quiet even under -v.
+logging.getLogger('urllib3').setLevel(logging.WARNING)
+
+# Bounded concurrency for per-app API fetches and artifact downloads,
+# chosen to stay polite to the OpenLyst server.
+MAX_WORKERS = 16
+
+# Streaming-download chunk size. 1 MiB keeps syscall/iteration overhead low
+# and is large enough for hashlib to release the GIL while hashing, so
+# downloads hashed on the thread pool overlap on multiple cores.
+CHUNK_SIZE = 1 << 20
 
 
 # =============================================================================
@@ -54,7 +77,61 @@ class OpenLystClient:
         self.session.headers.update({
             'User-Agent': 'Openlyst-Unified-Builder/1.0'
         })
-    
+        # Pool sized for the thread-pool fan-out so concurrent workers reuse
+        # keep-alive connections instead of paying a TLS handshake per call,
+        # with retries for transient CDN/API hiccups.
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._http_cache_path = ".http-cache.db"
+        self._http_cache_lock = threading.Lock()
+
+    def _get_json(self, url: str, params: Dict) -> Optional[Dict]:
+        """GET a JSON endpoint with conditional-request caching.
+
+        Each response body is stored on disk alongside its ETag and
+        Last-Modified validators; later calls send If-None-Match /
+        If-Modified-Since, and a 304 reuses the cached body without
+        transferring or re-parsing the JSON. Persisting the cache lets CI
+        rebuilds with unchanged upstream data skip the payloads entirely.
+        """
+        key = f"{url}?{'&'.join(f'{k}={v}' for k, v in sorted(params.items()))}"
+        with self._http_cache_lock:
+            with shelve.open(self._http_cache_path) as db:
+                cached = db.get(key)
+
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        response = self.session.get(url, params=params, headers=headers or None, timeout=30)
+        if cached and response.status_code == 304:
+            logger.debug("304 Not Modified for %s; using cached body", key)
+            return cached['data']
+        response.raise_for_status()
+
+        if orjson is not None:
+            data = orjson.loads(response.content)
+        else:
+            data = response.json()
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            with self._http_cache_lock:
+                with shelve.open(self._http_cache_path) as db:
+                    db[key] = {'etag': etag, 'last_modified': last_modified, 'data': data}
+        return data
+
     def get_all_apps(self, platform: str = "iOS", lang: str = "en") -> List[Dict]:
         """Fetch all apps from OpenLyst for specified platform"""
         try:
@@ -66,10 +143,7 @@ class OpenLystClient:
             }
             
             logger.info(f"Fetching apps from {url} for platform {platform}")
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(url, params)
             if data.get('success'):
                 apps = data.get('data', [])
                 logger.info(f"Successfully fetched {len(apps)} apps")
@@ -88,10 +162,7 @@ class OpenLystClient:
             url = f"{self.BASE_URL}/apps/{slug}"
             params = {'lang': lang}
             
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(url, params)
             if data.get('success'):
                 return data.get('data')
             return None
@@ -106,13 +177,10 @@ class OpenLystClient:
             url = f"{self.BASE_URL}/apps/{slug}/versions"
             params = {'lang': lang}
             
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(url, params)
             if data.get('success'):
                 versions = data.get('data', [])
-                logger.debug(f"Fetched {len(versions) if isinstance(versions, list) else '?'} versions for {slug}")
+                logger.debug("Fetched %s versions for %s", len(versions) if isinstance(versions, list) else '?', slug)
                 return versions if isinstance(versions, list) else []
             return []
                 
@@ -125,10 +193,91 @@ class OpenLystClient:
 # Utility Functions (Shared)
 # =============================================================================
 
-def get_file_size(url: str) -> Optional[int]:
+class ArtifactCache:
+    """On-disk cache for download-derived artifact metadata.
+
+    Entries are keyed by URL plus the upstream ETag/Last-Modified validators,
+    so a single HEAD request is enough to decide whether a previously
+    computed size/sha256/permissions result is still valid. This lets
+    repeated CI builds skip re-downloading unchanged IPAs/APKs entirely.
+    """
+
+    def __init__(self, path: str = ".build-cache.db"):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def make_key(self, url: str, session: Optional[requests.Session] = None) -> Optional[str]:
+        """Build a cache key from the URL's validators, or None if it has none"""
+        try:
+            http = session or requests
+            response = http.head(url, timeout=10, allow_redirects=True)
+            etag = response.headers.get('ETag', '')
+            last_modified = response.headers.get('Last-Modified', '')
+            if not etag and not last_modified:
+                return None
+            return f"{url}|{etag}|{last_modified}"
+        except Exception as e:
+            logger.debug("Could not build cache key for %s: %s", url, e)
+            return None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            with shelve.open(self.path) as db:
+                return db.get(key)
+
+    def update(self, key: str, values: Dict[str, Any]) -> None:
+        with self._lock:
+            with shelve.open(self.path) as db:
+                entry = db.get(key, {})
+                entry.update(values)
+                db[key] = entry
+
+
+artifact_cache = ArtifactCache()
+
+
+def write_json(path: Any, data: Any) -> None:
+    """Atomically write data as indented JSON.
+
+    Serializes to bytes first (orjson's C serializer when available), writes
+    them in one syscall to a tempfile in the target directory, and
+    os.replace's it into place — so a crash mid-build never leaves a
+    truncated apps.json/index.json behind.
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+    path = os.fspath(path)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.json')
+    try:
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_plist(data: bytes) -> Any:
+    """Parse plist bytes, dispatching on the magic header.
+
+    Passing an explicit format skips plistlib's sniffing and routes binary
+    plists (the common case for modern Info.plist files) straight to the
+    fast binary reader instead of the expat-backed XML parser.
+    """
+    fmt = plistlib.FMT_BINARY if data[:8] == b'bplist00' else plistlib.FMT_XML
+    return plistlib.loads(data, fmt=fmt)
+
+
+def get_file_size(url: str, session: Optional[requests.Session] = None) -> Optional[int]:
     """Get file size from URL without downloading"""
     try:
-        response = requests.head(url, timeout=10, allow_redirects=True)
+        http = session or requests
+        response = http.head(url, timeout=10, allow_redirects=True)
         if 'content-length' in response.headers:
             return int(response.headers['content-length'])
     except Exception as e:
@@ -136,39 +285,114 @@ def get_file_size(url: str) -> Optional[int]:
     return None
 
 
-def get_sha256(url: str) -> Optional[str]:
-    """Calculate SHA256 hash of download file"""
+# In-process memo so a URL shared between formulae (e.g. the same installer
+# in the macOS and Linux passes) is hashed at most once per run, even when
+# the server provides no validators for the on-disk ArtifactCache.
+_sha256_memo: Dict[str, str] = {}
+_sha256_memo_lock = threading.Lock()
+
+
+def get_sha256(url: str, session: Optional[requests.Session] = None) -> Optional[str]:
+    """Calculate SHA256 hash of a download URL or local file"""
+    with _sha256_memo_lock:
+        if url in _sha256_memo:
+            return _sha256_memo[url]
+
+    # Local paths (and file:// URLs) skip HTTP entirely; hashlib.file_digest
+    # (3.11+) reads and hashes in a C-level loop that releases the GIL.
+    if '://' not in url or url.startswith('file://'):
+        path = url[len('file://'):] if url.startswith('file://') else url
+        try:
+            with open(path, 'rb') as f:
+                if hasattr(hashlib, 'file_digest'):
+                    digest = hashlib.file_digest(f, 'sha256').hexdigest()
+                else:
+                    sha256 = hashlib.sha256()
+                    while chunk := f.read(CHUNK_SIZE):
+                        sha256.update(chunk)
+                    digest = sha256.hexdigest()
+            with _sha256_memo_lock:
+                _sha256_memo[url] = digest
+            return digest
+        except OSError as e:
+            logger.warning(f"Failed to calculate SHA256 for {path}: {e}")
+            return None
+
+    http = session or requests
+    cache_key = artifact_cache.make_key(url, session)
+    if cache_key:
+        cached = artifact_cache.get(cache_key)
+        if cached and cached.get('sha256'):
+            logger.debug("Using cached SHA256 for %s", url)
+            with _sha256_memo_lock:
+                _sha256_memo[url] = cached['sha256']
+            return cached['sha256']
+
     try:
         logger.info(f"Calculating SHA256 for {url}")
-        response = requests.get(url, timeout=60)
-        if response.status_code == 200:
-            return hashlib.sha256(response.content).hexdigest()
-        return None
+        sha256 = hashlib.sha256()
+        with http.get(url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                sha256.update(chunk)
+        digest = sha256.hexdigest()
+        if cache_key:
+            artifact_cache.update(cache_key, {'sha256': digest})
+        with _sha256_memo_lock:
+            _sha256_memo[url] = digest
+        return digest
     except Exception as e:
         logger.warning(f"Failed to calculate SHA256 for {url}: {e}")
         return None
 
 
+_RE_SHA256_HEX = re.compile(r'[0-9A-Fa-f]{64}')
+
+
+def extract_vendor_sha256(version: Dict) -> Optional[str]:
+    """Return an upstream-supplied SHA256 from version metadata, if present.
+
+    Some publishers ship the digest alongside the download URL; using it
+    saves the full artifact download that get_sha256 would otherwise make.
+    Only well-formed 64-digit hex values are trusted.
+    """
+    for field in ('sha256', 'checksum'):
+        value = version.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+            if _RE_SHA256_HEX.fullmatch(value):
+                return value.lower()
+    return None
+
+
+# Precompiled patterns for sanitize_name; these run per-app per-version,
+# so avoid re-parsing (and re's bounded cache) on every call.
+_RE_CLASS = re.compile(r'[^a-zA-Z0-9]')
+_RE_PACKAGE = re.compile(r'[^a-zA-Z0-9.]')
+_RE_FILENAME = re.compile(r'[^a-zA-Z0-9_-]')
+
+
+@lru_cache(maxsize=4096)
 def sanitize_name(name: str, style: str = "class") -> str:
     """Sanitize name for various formats
-    
+
     Args:
         name: The name to sanitize
         style: 'class' for Ruby class names, 'package' for package IDs, 'filename' for filenames
     """
     if style == "class":
         # Convert to valid Ruby class name
-        sanitized = re.sub(r'[^a-zA-Z0-9]', '', name.title())
+        sanitized = _RE_CLASS.sub('', name.title())
         if sanitized and not sanitized[0].isalpha():
             sanitized = f"App{sanitized}"
         return sanitized
     elif style == "package":
         # Convert to valid package/bundle ID
-        sanitized = re.sub(r'[^a-zA-Z0-9.]', '', name.lower())
+        sanitized = _RE_PACKAGE.sub('', name.lower())
         return sanitized
     elif style == "filename":
         # Convert to safe filename
-        sanitized = re.sub(r'[^a-zA-Z0-9_-]', '', name.lower().replace(' ', '-'))
+        sanitized = _RE_FILENAME.sub('', name.lower().replace(' ', '-'))
         return sanitized
     return name
 
@@ -177,9 +401,16 @@ def sanitize_name(name: str, style: str = "class") -> str:
 # AltStore Repository Builder
 # =============================================================================
 
+# Categories accepted by the AltStore source format.
+_VALID_CATEGORIES = frozenset({
+    'developer', 'entertainment', 'games', 'lifestyle',
+    'other', 'photo-video', 'social', 'utilities'
+})
+
+
 class AltStoreBuilder:
     """Builder for AltStore repository JSON"""
-    
+
     def __init__(self, client: OpenLystClient, base_repo_url: str = "https://raw.githubusercontent.com/justacalico/Openlyst-more-builds/main/repo"):
         self.client = client
         self.base_repo_url = base_repo_url
@@ -188,100 +419,150 @@ class AltStoreBuilder:
         """Extract iOS IPA download URL from version data"""
         if not isinstance(version, dict):
             return None
-        
+
+        # Called once per version per app, so strip/validate each candidate
+        # exactly once and short-circuit on the first hit.
+
         # Primary: Check downloads.iOS
         downloads = version.get('downloads')
         if isinstance(downloads, dict):
-            ios_download = downloads.get('iOS')
-            if isinstance(ios_download, str) and ios_download.strip():
-                return ios_download.strip()
-        
+            url = downloads.get('iOS')
+            if isinstance(url, str):
+                url = url.strip()
+                if url:
+                    return url
+
         # Fallback: Check platformInstall.iOS
         platform_install = version.get('platformInstall')
         if isinstance(platform_install, dict):
-            ios_install = platform_install.get('iOS')
-            if isinstance(ios_install, str) and ios_install.strip() and ios_install.startswith('http'):
-                return ios_install.strip()
-        
+            url = platform_install.get('iOS')
+            if isinstance(url, str):
+                url = url.strip()
+                if url.startswith('http'):
+                    return url
+
         # Last fallback: Try direct downloadURL field
-        download_url = version.get('downloadURL')
-        if download_url and isinstance(download_url, str) and download_url.strip().startswith('http'):
-            return download_url.strip()
-        
+        url = version.get('downloadURL')
+        if isinstance(url, str):
+            url = url.strip()
+            if url.startswith('http'):
+                return url
+
         return None
     
-    def extract_permissions_from_ipa(self, ipa_url: str) -> Optional[Dict[str, Any]]:
-        """Download IPA and extract entitlements and privacy usage descriptions."""
+    def fetch_ipa_info(self, ipa_url: str) -> Optional[Dict[str, Any]]:
+        """Download IPA once, computing size and SHA256 while streaming.
+
+        Returns a dict with 'size', 'sha256' and 'permissions' so callers
+        don't need a separate HEAD request or a second download pass.
+        Results are cached on disk keyed by the URL's ETag/Last-Modified, so
+        unchanged IPAs cost a single HEAD request on subsequent builds.
+        """
+        cache_key = artifact_cache.make_key(ipa_url, self.client.session)
+        if cache_key:
+            cached = artifact_cache.get(cache_key)
+            if cached and cached.get('sha256'):
+                logger.debug("Using cached artifact info for %s", ipa_url)
+                return cached
+
         try:
-            with tempfile.NamedTemporaryFile(suffix=".ipa", delete=True) as tmp:
-                logger.info(f"Downloading IPA for permissions: {ipa_url}")
+            # Spooled buffer keeps small IPAs in memory and only spills
+            # to disk past 64 MiB, avoiding a write+read disk roundtrip.
+            with tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024, suffix=".ipa") as tmp:
+                logger.info(f"Downloading IPA: {ipa_url}")
+                sha256 = hashlib.sha256()
+                size = 0
                 with self.client.session.get(ipa_url, stream=True, timeout=60) as r:
                     r.raise_for_status()
-                    for chunk in r.iter_content(chunk_size=1024 * 256):
+                    for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
                         if chunk:
                             tmp.write(chunk)
-                tmp.flush()
-
-                entitlements: List[str] = []
-                privacy: Dict[str, str] = {}
-
-                with zipfile.ZipFile(tmp.name, 'r') as z:
-                    app_dirs = [
-                        name for name in z.namelist()
-                        if name.startswith('Payload/') and name.endswith('.app/')
-                    ]
-                    if not app_dirs:
-                        logger.warning("IPA does not contain a Payload .app directory")
-                        return None
-                    app_dir = app_dirs[0]
-
-                    # Parse Info.plist for privacy usage descriptions
-                    info_path = app_dir + 'Info.plist'
-                    if info_path in z.namelist():
-                        with z.open(info_path) as f:
-                            try:
-                                plist = plistlib.load(f)
-                                for k, v in plist.items():
-                                    if isinstance(k, str) and k.endswith('UsageDescription') and isinstance(v, str):
-                                        privacy[k] = v
-                            except Exception as e:
-                                logger.debug(f"Failed parsing Info.plist: {e}")
-
-                    # Parse entitlements
-                    for ent_path in [app_dir + 'archived-expanded-entitlements.xcent', app_dir + 'entitlements.plist']:
-                        if ent_path in z.namelist():
-                            with z.open(ent_path) as f:
-                                try:
-                                    ent_plist = plistlib.load(f)
-                                    if isinstance(ent_plist, dict):
-                                        entitlements = sorted(list(ent_plist.keys()))
-                                except Exception as e:
-                                    logger.debug(f"Failed parsing entitlements: {e}")
-                            break
-
-                # Filter out common entitlements
-                filtered_ents = [
-                    e for e in entitlements
-                    if e not in ("com.apple.developer.team-identifier", "application-identifier")
-                ]
+                            sha256.update(chunk)
+                            size += len(chunk)
+                tmp.seek(0)
+
+                info = {
+                    'size': size,
+                    'sha256': sha256.hexdigest(),
+                    'permissions': self.extract_permissions(tmp),
+                }
+                if cache_key:
+                    artifact_cache.update(cache_key, info)
+                return info
+
+        except Exception as e:
+            logger.info(f"Could not download IPA from {ipa_url}: {e}")
+            return None
+
+    def extract_permissions(self, ipa_file: Any) -> Optional[Dict[str, Any]]:
+        """Extract entitlements and privacy usage descriptions from a local IPA.
+
+        Accepts a path or a seekable file object (e.g. the spooled download
+        buffer from fetch_ipa_info).
+        """
+        try:
+            entitlements: List[str] = []
+            privacy: Dict[str, str] = {}
 
-                if not filtered_ents and not privacy:
+            with zipfile.ZipFile(ipa_file, 'r') as z:
+                # namelist() rebuilds its list on every call and membership
+                # tests against it are O(N); call it once and use a set for
+                # the lookups while keeping archive order for app_dirs.
+                namelist = z.namelist()
+                names = set(namelist)
+                app_dirs = [
+                    name for name in namelist
+                    if name.startswith('Payload/') and name.endswith('.app/')
+                ]
+                if not app_dirs:
+                    logger.warning("IPA does not contain a Payload .app directory")
                     return None
+                app_dir = app_dirs[0]
+
+                # Parse Info.plist for privacy usage descriptions
+                info_path = app_dir + 'Info.plist'
+                if info_path in names:
+                    try:
+                        plist = load_plist(z.read(info_path))
+                        privacy = {
+                            k: v for k, v in plist.items()
+                            if isinstance(k, str) and k.endswith('UsageDescription') and isinstance(v, str)
+                        }
+                    except Exception as e:
+                        logger.debug("Failed parsing Info.plist: %s", e)
+
+                # Parse entitlements
+                for ent_path in [app_dir + 'archived-expanded-entitlements.xcent', app_dir + 'entitlements.plist']:
+                    if ent_path in names:
+                        try:
+                            ent_plist = load_plist(z.read(ent_path))
+                            if isinstance(ent_plist, dict):
+                                entitlements = sorted(ent_plist.keys())
+                        except Exception as e:
+                            logger.debug("Failed parsing entitlements: %s", e)
+                        break
 
-                return {"entitlements": filtered_ents, "privacy": privacy}
+            # Filter out common entitlements
+            filtered_ents = [
+                e for e in entitlements
+                if e not in ("com.apple.developer.team-identifier", "application-identifier")
+            ]
+
+            if not filtered_ents and not privacy:
+                return None
+
+            return {"entitlements": filtered_ents, "privacy": privacy}
 
         except Exception as e:
             logger.info(f"Could not extract permissions from IPA: {e}")
             return None
     
-    def _map_category(self, category: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _map_category(category: str) -> str:
         """Map category to valid AltStore category"""
-        valid_categories = {
-            'developer', 'entertainment', 'games', 'lifestyle',
-            'other', 'photo-video', 'social', 'utilities'
-        }
         category = str(category).lower().replace(' ', '-')
-        return category if category in valid_categories else 'other'
+        return category if category in _VALID_CATEGORIES else 'other'
     
     def _process_screenshots(self, screenshots: Any) -> List[str]:
         """Process screenshots array"""
@@ -302,38 +583,52 @@ class AltStoreBuilder:
                 logger.warning(f"No versions found for app {slug}")
                 return None
             
-            altstore_versions = []
+            now_iso = datetime.now().isoformat()
+            candidates = []
             for version_data in versions[:10]:
                 if not isinstance(version_data, dict):
                     continue
-                
+
                 ipa_url = self.extract_ipa_url(version_data)
                 if not ipa_url:
-                    logger.debug(f"No IPA URL found for {slug} version {version_data.get('version')}")
+                    logger.debug("No IPA URL found for %s version %s", slug, version_data.get('version'))
                     continue
-                
-                size = get_file_size(ipa_url)
-                
+
+                candidates.append((version_data, ipa_url))
+
+            if not candidates:
+                logger.warning(f"No valid IPA versions found for app {slug}")
+                return None
+
+            # The latest version's size comes from the fused download below;
+            # older versions only need a HEAD probe, issued as one concurrent
+            # wave instead of one blocking HEAD per version.
+            older_urls = [ipa_url for _, ipa_url in candidates[1:]]
+            sizes: Dict[str, Optional[int]] = {}
+            if older_urls:
+                with ThreadPoolExecutor(max_workers=min(8, len(older_urls))) as executor:
+                    sizes = dict(zip(older_urls, executor.map(
+                        lambda url: get_file_size(url, self.client.session), older_urls
+                    )))
+
+            altstore_versions = []
+            for index, (version_data, ipa_url) in enumerate(candidates):
                 altstore_version = {
                     "version": str(version_data.get('version', '1.0')),
                     "buildVersion": str(version_data.get('buildVersion', '1')),
-                    "date": str(version_data.get('date', datetime.now().isoformat())),
+                    "date": str(version_data.get('date', now_iso)),
                     "downloadURL": ipa_url,
                 }
-                
-                if size:
-                    altstore_version['size'] = size
-                
+
+                if index and sizes.get(ipa_url):
+                    altstore_version['size'] = sizes[ipa_url]
+
                 description = version_data.get('localizedDescription')
                 if description and isinstance(description, str):
                     altstore_version['localizedDescription'] = description
-                
+
                 altstore_versions.append(altstore_version)
             
-            if not altstore_versions:
-                logger.warning(f"No valid IPA versions found for app {slug}")
-                return None
-            
             app_entry = {
                 "name": str(app.get('name', 'Unknown App')),
                 "bundleIdentifier": str(app.get('bundleIdentifier', slug)),
@@ -346,12 +641,21 @@ class AltStoreBuilder:
                 "versions": altstore_versions,
             }
             
-            # Extract permissions from latest IPA
+            # Single streaming pass over the latest IPA: size, SHA256 and
+            # permissions without extra HEAD/GET round-trips.
             latest_ipa = altstore_versions[0].get("downloadURL")
             if latest_ipa:
-                perms = self.extract_permissions_from_ipa(latest_ipa)
-                if perms:
-                    app_entry["appPermissions"] = perms
+                ipa_info = self.fetch_ipa_info(latest_ipa)
+                if ipa_info:
+                    if ipa_info['size']:
+                        altstore_versions[0]['size'] = ipa_info['size']
+                    altstore_versions[0]['sha256'] = ipa_info['sha256']
+                    if ipa_info['permissions']:
+                        app_entry["appPermissions"] = ipa_info['permissions']
+                else:
+                    size = get_file_size(latest_ipa, self.client.session)
+                    if size:
+                        altstore_versions[0]['size'] = size
             
             if app.get('screenshots'):
                 app_entry['screenshots'] = self._process_screenshots(app['screenshots'])
@@ -375,18 +679,13 @@ class AltStoreBuilder:
                 return False
             
             logger.info("Building AltStore app entries...")
-            app_entries = []
-            
-            for app in apps:
-                slug = app.get('slug')
-                if not slug:
-                    continue
-                
-                logger.info(f"Processing app: {slug}")
-                app_entry = self.build_app_entry(app, slug)
-                
-                if app_entry:
-                    app_entries.append(app_entry)
+            tasks = [(app, app['slug']) for app in apps if app.get('slug')]
+
+            # Per-app work is dominated by network latency, so process apps
+            # concurrently. executor.map preserves the API's app order.
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                results = executor.map(lambda task: self.build_app_entry(*task), tasks)
+                app_entries = [entry for entry in results if entry]
             
             if not app_entries:
                 logger.error("No valid app entries created")
@@ -400,14 +699,13 @@ class AltStoreBuilder:
                 "headerURL": urljoin(self.base_repo_url, "header.png"),
                 "website": "https://openlyst.ink",
                 "tintColor": "#dc2626",
-                "featuredApps": [app['bundleIdentifier'] for app in app_entries[:5]],
+                "featuredApps": list(map(itemgetter('bundleIdentifier'), app_entries[:5])),
                 "apps": app_entries,
                 "news": []
             }
             
             repo_file = os.path.join(output_dir, "apps.json")
-            with open(repo_file, 'w', encoding='utf-8') as f:
-                json.dump(repository, f, indent=2, ensure_ascii=False)
+            write_json(repo_file, repository)
             
             logger.info(f"AltStore repository built: {repo_file} ({len(app_entries)} apps)")
             
@@ -420,8 +718,7 @@ class AltStoreBuilder:
             }
             
             index_file = os.path.join(output_dir, "index.json")
-            with open(index_file, 'w', encoding='utf-8') as f:
-                json.dump(index_data, f, indent=2)
+            write_json(index_file, index_data)
             
             return True
         
@@ -434,6 +731,43 @@ class AltStoreBuilder:
 # F-Droid Repository Builder
 # =============================================================================
 
+# F-Droid metadata YAML templates, filled per app in build_metadata_yml.
+_YML_HEADER = """Categories:
+  - {category}
+License: Unknown
+AuthorName: {author_name}
+AuthorWebSite: {website}
+WebSite: {website}
+SourceCode: {source_code}
+IssueTracker: {issue_tracker}
+
+AutoName: {name}
+Summary: {summary}
+
+Description: |
+    {description}
+
+RepoType: git
+Repo: {source_code}
+
+Builds:
+"""
+
+_YML_BUILD = """
+  - versionName: '{version_name}'
+    versionCode: {version_code}
+    commit: v{version_name}
+    subdir: app
+    gradle:
+      - yes
+"""
+
+_YML_FOOTER = """
+CurrentVersion: '{version_name}'
+CurrentVersionCode: {version_code}
+"""
+
+
 class FDroidBuilder:
     """Builder for F-Droid repository metadata"""
     
@@ -448,121 +782,131 @@ class FDroidBuilder:
         
         downloads = version.get('downloads')
         if isinstance(downloads, dict):
-            android_download = downloads.get('Android')
-            if isinstance(android_download, str) and android_download.strip():
-                return android_download.strip()
+            url = downloads.get('Android')
+            if isinstance(url, str):
+                url = url.strip()
+                if url:
+                    return url
             # Handle nested structure (e.g., downloads.Android.apk)
-            if isinstance(android_download, dict):
-                for key in ['apk', 'universal', 'arm64', 'arm', 'x86_64', 'x86']:
-                    if key in android_download and android_download[key]:
-                        return android_download[key]
-        
-        download_url = version.get('downloadURL')
-        if download_url and isinstance(download_url, str) and download_url.strip().startswith('http'):
-            return download_url.strip()
-        
+            elif isinstance(url, dict):
+                for key in ('apk', 'universal', 'arm64', 'arm', 'x86_64', 'x86'):
+                    if url.get(key):
+                        return url[key]
+
+        url = version.get('downloadURL')
+        if isinstance(url, str):
+            url = url.strip()
+            if url.startswith('http'):
+                return url
+
         return None
     
-    def _map_fdroid_category(self, category: str) -> str:
+    _FDROID_CATEGORY_MAP = {
+        'entertainment': 'Multimedia',
+        'games': 'Games',
+        'lifestyle': 'System',
+        'photo-video': 'Multimedia',
+        'social': 'Internet',
+        'utilities': 'System',
+        'developer': 'Development',
+        'other': 'System'
+    }
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _map_fdroid_category(category: str) -> str:
         """Map category to F-Droid category"""
-        category_map = {
-            'entertainment': 'Multimedia',
-            'games': 'Games',
-            'lifestyle': 'System',
-            'photo-video': 'Multimedia',
-            'social': 'Internet',
-            'utilities': 'System',
-            'developer': 'Development',
-            'other': 'System'
-        }
         category = str(category).lower().replace(' ', '-')
-        return category_map.get(category, 'System')
+        return FDroidBuilder._FDROID_CATEGORY_MAP.get(category, 'System')
     
-    def build_metadata_yml(self, app: Dict, versions: List[Dict]) -> Optional[str]:
+    def _annotate_versions(self, versions: List[Dict]) -> List[tuple]:
+        """Pair each version with its APK URL, dropping versions without one.
+
+        Resolving the URLs once here lets _process_app, build_metadata_yml
+        and build_index_json share the result instead of re-walking the same
+        version dicts.
+        """
+        return [(v, url) for v in versions if (url := self.extract_apk_url(v))]
+
+    def build_metadata_yml(self, app: Dict, versions: List[Dict], annotated: List[tuple]) -> Optional[str]:
         """Build F-Droid metadata YAML content for an app"""
         if not versions:
             return None
-        
+
         latest_version = versions[0]
-        apk_url = self.extract_apk_url(latest_version)
-        
-        if not apk_url:
+        if not annotated or annotated[0][0] is not latest_version:
+            # The latest version has no APK
             return None
-        
-        # Build YAML content (F-Droid metadata format)
+
+        # Build YAML content (F-Droid metadata format). Collect the pieces in
+        # a list and join once instead of growing one string per version.
         name = app.get('name', 'Unknown')
-        package_id = app.get('bundleIdentifier', sanitize_name(name, 'package'))
-        
-        metadata = f"""Categories:
-  - {self._map_fdroid_category(app.get('category', 'other'))}
-License: Unknown
-AuthorName: {app.get('developerName', 'OpenLyst Developer')}
-AuthorWebSite: {app.get('website', 'https://openlyst.ink')}
-WebSite: {app.get('website', 'https://openlyst.ink')}
-SourceCode: {app.get('sourceCode', '')}
-IssueTracker: {app.get('issueTracker', '')}
 
-AutoName: {name}
-Summary: {app.get('subtitle', name)[:80]}
+        parts = [_YML_HEADER.format_map({
+            'category': self._map_fdroid_category(app.get('category', 'other')),
+            'author_name': app.get('developerName', 'OpenLyst Developer'),
+            'website': app.get('website', 'https://openlyst.ink'),
+            'source_code': app.get('sourceCode', ''),
+            'issue_tracker': app.get('issueTracker', ''),
+            'name': name,
+            'summary': app.get('subtitle', name)[:80],
+            'description': app.get('localizedDescription', app.get('description', 'A free and open source app.')),
+        })]
 
-Description: |
-    {app.get('localizedDescription', app.get('description', 'A free and open source app.'))}
+        # Add version entries
+        for v, _ in annotated[:5]:
+            parts.append(_YML_BUILD.format_map({
+                'version_name': v.get('version', '1.0'),
+                'version_code': v.get('buildVersion', '1'),
+            }))
 
-RepoType: git
-Repo: {app.get('sourceCode', '')}
+        parts.append(_YML_FOOTER.format_map({
+            'version_name': latest_version.get('version', '1.0'),
+            'version_code': latest_version.get('buildVersion', '1'),
+        }))
 
-Builds:
-"""
-        # Add version entries
-        for v in versions[:5]:
-            version_code = v.get('buildVersion', '1')
-            version_name = v.get('version', '1.0')
-            apk = self.extract_apk_url(v)
-            if apk:
-                metadata += f"""
-  - versionName: '{version_name}'
-    versionCode: {version_code}
-    commit: v{version_name}
-    subdir: app
-    gradle:
-      - yes
-"""
-        
-        metadata += f"""
-CurrentVersion: '{latest_version.get('version', '1.0')}'
-CurrentVersionCode: {latest_version.get('buildVersion', '1')}
-"""
-        
-        return metadata
+        return ''.join(parts)
     
     def build_index_json(self, apps_data: List[Dict]) -> Dict:
         """Build F-Droid index.json"""
+        # Resolve all APK sizes up front with concurrent HEAD requests so the
+        # per-version loop below is pure dict lookups.
+        unique_urls = list({
+            apk_url
+            for app_data in apps_data
+            for _, apk_url in app_data['annotated'][:5]
+        })
+        url_sizes: Dict[str, Optional[int]] = {}
+        now_ms = time.time_ns() // 1_000_000
+        if unique_urls:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                url_sizes = dict(zip(
+                    unique_urls,
+                    executor.map(lambda url: get_file_size(url, self.client.session), unique_urls)
+                ))
+
         packages = {}
-        
+
         for app_data in apps_data:
             app = app_data['app']
-            versions = app_data['versions']
             package_id = app.get('bundleIdentifier', sanitize_name(app.get('name', 'unknown'), 'package'))
-            
-            package_versions = []
-            for v in versions[:5]:
-                apk_url = self.extract_apk_url(v)
-                if not apk_url:
-                    continue
-                
-                package_versions.append({
-                    "added": int(datetime.now().timestamp() * 1000),
+
+            package_versions = [
+                {
+                    "added": now_ms,
                     "apkName": f"{package_id}-{v.get('version', '1.0')}.apk",
-                    "hash": "",  # Would need to download to calculate
+                    "hash": extract_vendor_sha256(v) or "",
                     "hashType": "sha256",
                     "minSdkVersion": 21,
                     "packageName": package_id,
-                    "size": get_file_size(apk_url) or 0,
+                    "size": url_sizes.get(apk_url) or 0,
                     "targetSdkVersion": 34,
                     "versionCode": int(v.get('buildVersion', 1)),
                     "versionName": v.get('version', '1.0')
-                })
-            
+                }
+                for v, apk_url in app_data['annotated'][:5]
+            ]
+
             if package_versions:
                 packages[package_id] = package_versions
         
@@ -572,7 +916,7 @@ CurrentVersionCode: {latest_version.get('buildVersion', '1')}
                 "description": "Free and open source Android applications from OpenLyst",
                 "icon": "icon.png",
                 "address": self.base_repo_url,
-                "timestamp": int(datetime.now().timestamp() * 1000),
+                "timestamp": now_ms,
                 "version": 21
             },
             "requests": {
@@ -589,14 +933,30 @@ CurrentVersionCode: {latest_version.get('buildVersion', '1')}
                     "license": "Unknown",
                     "categories": [self._map_fdroid_category(app_data['app'].get('category', 'other'))],
                     "webSite": app_data['app'].get('website', 'https://openlyst.ink'),
-                    "added": int(datetime.now().timestamp() * 1000),
-                    "lastUpdated": int(datetime.now().timestamp() * 1000)
+                    "added": now_ms,
+                    "lastUpdated": now_ms
                 }
                 for app_data in apps_data
             ],
             "packages": packages
         }
     
+    def _process_app(self, app: Dict) -> Optional[tuple]:
+        """Fetch versions for one app and build its metadata, skipping non-Android apps"""
+        slug = app['slug']
+        logger.debug("Processing app: %s", slug)
+        versions = self.client.get_app_versions(slug)
+
+        if not versions:
+            return None
+
+        annotated = self._annotate_versions(versions)
+        if not annotated:
+            logger.debug("No Android versions for %s", slug)
+            return None
+
+        return app, versions, annotated, self.build_metadata_yml(app, versions, annotated)
+
     def build(self, output_dir: str = "fdroid-repo", calculate_info: bool = False) -> bool:
         """Build the complete F-Droid repository"""
         try:
@@ -613,40 +973,33 @@ CurrentVersionCode: {latest_version.get('buildVersion', '1')}
             
             logger.info(f"Building F-Droid metadata for {len(apps)} apps...")
             
+            # Skip apps whose listing already rules out Android so no version
+            # request is issued for them; the API platform filter is advisory.
+            tasks = [
+                app for app in apps
+                if app.get('slug') and (not app.get('platforms') or 'Android' in app['platforms'])
+            ]
+
+            # Version fetches are independent network calls, so run them
+            # concurrently and keep the file writes on the main thread.
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                results = list(executor.map(self._process_app, tasks))
+
             apps_data = []
             generated_count = 0
-            
-            for app in apps:
-                slug = app.get('slug')
-                if not slug:
-                    continue
-                
-                logger.info(f"Processing app: {slug}")
-                versions = self.client.get_app_versions(slug)
-                
-                if not versions:
-                    continue
-                
-                # Check if Android versions exist
-                has_android = False
-                for v in versions:
-                    if self.extract_apk_url(v):
-                        has_android = True
-                        break
-                
-                if not has_android:
-                    logger.debug(f"No Android versions for {slug}")
+
+            for i, result in enumerate(results, 1):
+                if i % 50 == 0:
+                    logger.info(f"Progress: {i}/{len(results)} apps processed")
+                if not result:
                     continue
-                
-                apps_data.append({'app': app, 'versions': versions})
-                
-                # Write metadata YAML
-                metadata = self.build_metadata_yml(app, versions)
+                app, versions, annotated, metadata = result
+                apps_data.append({'app': app, 'versions': versions, 'annotated': annotated})
+
                 if metadata:
-                    package_id = app.get('bundleIdentifier', sanitize_name(app.get('name', slug), 'package'))
-                    metadata_file = os.path.join(metadata_dir, f"{package_id}.yml")
-                    with open(metadata_file, 'w', encoding='utf-8') as f:
-                        f.write(metadata)
+                    package_id = app.get('bundleIdentifier', sanitize_name(app.get('name', app['slug']), 'package'))
+                    metadata_file = Path(metadata_dir) / f"{package_id}.yml"
+                    metadata_file.write_bytes(metadata.encode('utf-8'))
                     generated_count += 1
             
             if not apps_data:
@@ -656,8 +1009,7 @@ CurrentVersionCode: {latest_version.get('buildVersion', '1')}
             # Write index.json
             index = self.build_index_json(apps_data)
             index_file = os.path.join(output_dir, "index.json")
-            with open(index_file, 'w', encoding='utf-8') as f:
-                json.dump(index, f, indent=2, ensure_ascii=False)
+            write_json(index_file, index)
             
             logger.info(f"F-Droid repository built: {output_dir} ({generated_count} apps)")
             return True
@@ -671,48 +1023,106 @@ CurrentVersionCode: {latest_version.get('buildVersion', '1')}
 # Homebrew Tap Builder
 # =============================================================================
 
+# Homebrew formula template, filled per app in generate_formula_content.
+_MACOS_INSTALLER_EXTS = frozenset({'.dmg', '.pkg', '.app'})
+
+# Escapes for Ruby double-quoted strings in generated formulae. The '#'
+# escape disarms #{...} interpolation; Ruby reads \# as a literal '#'.
+_RUBY_TR = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': '\\n', '#': '\\#'})
+
+
+def escape_ruby(value: str) -> str:
+    """Escape a value for safe interpolation into a Ruby double-quoted string"""
+    return str(value).translate(_RUBY_TR)
+
+
+_FORMULA_TEMPLATE = '''class {class_name} < Formula
+  desc "{desc}"
+  homepage "{homepage}"
+  url "{url}"
+  version "{version}"
+{sha256_line}
+
+  def install
+{install_method}
+  end
+
+  test do
+    # Test that the application was installed
+    system "true"
+  end
+end
+'''
+
+
 class HomebrewBuilder:
     """Builder for Homebrew tap formulae"""
-    
+
+    # Per-platform download preference, consulted in order: each entry is
+    # (package key, arch preference). An empty arch tuple means the key maps
+    # straight to a URL string.
+    _DOWNLOAD_PRIORITY = {
+        "macOS": (
+            ('universal', ()),
+            ('arm64', ()),
+            ('x86_64', ()),
+        ),
+        "Linux": (
+            ('appimage', ('x86_64', 'arm64')),
+            ('zip', ('x86_64', 'arm64')),
+            ('deb', ('x86_64', 'arm64')),
+            ('rpm', ('x86_64', 'arm64')),
+        ),
+    }
+
     def __init__(self, client: OpenLystClient, output_dir: Path):
         self.client = client
         self.output_dir = output_dir
         self.formula_dir = output_dir / "Formula"
         self.formula_dir.mkdir(parents=True, exist_ok=True)
-    
+        # Version lists fetched once per slug and shared across the macOS
+        # and Linux passes when one builder instance handles both.
+        self._versions_cache: Dict[str, List[Dict]] = {}
+        self._versions_lock = threading.Lock()
+
+    def _get_versions(self, slug: str) -> List[Dict]:
+        """Fetch versions for a slug once, reusing them across platform passes"""
+        with self._versions_lock:
+            if slug in self._versions_cache:
+                return self._versions_cache[slug]
+        versions = self.client.get_app_versions(slug)
+        with self._versions_lock:
+            self._versions_cache[slug] = versions
+        return versions
+
     def get_download_url_for_platform(self, version: Dict, platform: str) -> Optional[str]:
         """Extract appropriate download URL for the specified platform"""
         downloads = version.get('downloads', {})
         platform_downloads = downloads.get(platform, {})
-        
+
         if not platform_downloads:
             return None
-        
-        if platform == "macOS":
-            for arch in ['universal', 'arm64', 'x86_64']:
-                if arch in platform_downloads and platform_downloads[arch]:
-                    return platform_downloads[arch]
-        
-        elif platform == "Linux":
-            for package_type in ['appimage', 'zip', 'deb', 'rpm']:
-                if package_type in platform_downloads:
-                    pkg_data = platform_downloads[package_type]
-                    if isinstance(pkg_data, dict):
-                        for arch in ['x86_64', 'arm64']:
-                            if arch in pkg_data and pkg_data[arch]:
-                                return pkg_data[arch]
-                    elif isinstance(pkg_data, str) and pkg_data:
-                        return pkg_data
-        
-        # Fallback
-        for key, value in platform_downloads.items():
+
+        for key, archs in self._DOWNLOAD_PRIORITY.get(platform, ()):
+            pkg_data = platform_downloads.get(key)
+            if not pkg_data:
+                continue
+            if isinstance(pkg_data, dict):
+                for arch in archs:
+                    if pkg_data.get(arch):
+                        return pkg_data[arch]
+            elif isinstance(pkg_data, str):
+                return pkg_data
+
+        # Fallback: first http(s) URL anywhere in the platform's downloads
+        for value in platform_downloads.values():
             if isinstance(value, dict):
-                for arch_key, arch_value in value.items():
+                for arch_value in value.values():
                     if isinstance(arch_value, str) and arch_value.startswith('http'):
                         return arch_value
             elif isinstance(value, str) and value.startswith('http'):
                 return value
-        
+
         return None
     
     def generate_formula_content(self, app: Dict, version: Dict, platform: str, calculate_sha256: bool = False) -> str:
@@ -723,43 +1133,37 @@ class HomebrewBuilder:
         if not download_url:
             raise ValueError(f"No download URL found for {app['name']} on {platform}")
         
-        url_path = urlparse(download_url).path
-        file_extension = Path(url_path).suffix.lower()
+        # Cheap extension sniff: strip query/fragment, then take everything
+        # from the last dot of the final path segment. Avoids spinning up
+        # urlparse + Path just for a suffix, once per formula.
+        path_only = download_url.partition('?')[0].partition('#')[0]
+        dot = path_only.rfind('.')
+        file_extension = path_only[dot:].lower() if dot > path_only.rfind('/') else ''
         
         sha256_line = '  # sha256 "REPLACE_WITH_ACTUAL_SHA256"'
         if calculate_sha256:
-            sha256_hash = get_sha256(download_url)
+            sha256_hash = extract_vendor_sha256(version) or get_sha256(download_url, self.client.session)
             if sha256_hash:
                 sha256_line = f'  sha256 "{sha256_hash}"'
         
-        homepage = app.get('website', 'https://openlyst.ink')
-        desc = app.get('subtitle', app.get('name', '')).replace('"', '\\"')
+        homepage = escape_ruby(app.get('website', 'https://openlyst.ink'))
+        desc = escape_ruby(app.get('subtitle', app.get('name', '')))
         
         # Determine installation method
-        if file_extension in ['.dmg', '.pkg', '.app']:
+        if file_extension in _MACOS_INSTALLER_EXTS:
             install_method = '    # macOS app installation\n    prefix.install Dir["*"]'
         else:
             install_method = '    # Generic installation\n    prefix.install Dir["*"]'
         
-        formula_content = f'''class {class_name} < Formula
-  desc "{desc}"
-  homepage "{homepage}"
-  url "{download_url}"
-  version "{version['version']}"
-{sha256_line}
-
-  def install
-{install_method}
-  end
-
-  test do
-    # Test that the application was installed
-    system "true"
-  end
-end
-'''
-        
-        return formula_content
+        return _FORMULA_TEMPLATE.format_map({
+            'class_name': class_name,
+            'desc': desc,
+            'homepage': homepage,
+            'url': escape_ruby(download_url),
+            'version': escape_ruby(version['version']),
+            'sha256_line': sha256_line,
+            'install_method': install_method,
+        })
     
     def generate_formula(self, app: Dict, versions: List[Dict], platform: str, calculate_sha256: bool = False) -> bool:
         """Generate Homebrew formula for an app"""
@@ -772,7 +1176,7 @@ end
         # Check platform support
         app_platforms = latest_version.get('platforms', [])
         if platform not in app_platforms:
-            logger.info(f"App {app.get('name', 'Unknown')} does not support {platform}")
+            logger.debug("App %s does not support %s", app.get('name', 'Unknown'), platform)
             return False
         
         try:
@@ -783,10 +1187,9 @@ end
             filename = f"{class_name.lower()}{suffix}.rb"
             formula_path = self.formula_dir / filename
             
-            with open(formula_path, 'w', encoding='utf-8') as f:
-                f.write(formula_content)
+            formula_path.write_bytes(formula_content.encode('utf-8'))
             
-            logger.info(f"Generated formula: {formula_path}")
+            logger.debug("Generated formula: %s", formula_path)
             return True
             
         except ValueError as e:
@@ -796,6 +1199,11 @@ end
             logger.error(f"Failed to generate formula for {app.get('name', 'Unknown')}: {e}")
             return False
     
+    def _process_app(self, app: Dict, platform: str, calculate_sha256: bool) -> bool:
+        """Fetch versions for one app and generate its formula"""
+        versions = self._get_versions(app['slug'])
+        return self.generate_formula(app, versions, platform, calculate_sha256)
+
     def build(self, platform: str = "macOS", calculate_sha256: bool = False) -> bool:
         """Build Homebrew tap for specified platform"""
         try:
@@ -808,22 +1216,25 @@ end
             
             logger.info(f"Found {len(apps)} apps for {platform}")
             
-            generated_count = 0
-            failed_count = 0
-            
-            for app in apps:
-                slug = app.get('slug')
-                if not slug:
-                    failed_count += 1
-                    continue
-                
-                versions = self.client.get_app_versions(slug)
-                
-                if self.generate_formula(app, versions, platform, calculate_sha256):
-                    generated_count += 1
-                else:
-                    failed_count += 1
-            
+            # Version fetches, hash downloads and formula writes are
+            # independent per app; sha256.update releases the GIL on large
+            # chunks, so a thread pool spreads the hashing across cores too.
+            # When the listing carries a per-app platforms field, use it to
+            # drop unsupported apps before spending a version RPC on them;
+            # generate_formula still re-checks against the version data.
+            tasks = [
+                app for app in apps
+                if app.get('slug') and (not app.get('platforms') or platform in app['platforms'])
+            ]
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                results = list(executor.map(
+                    lambda app: self._process_app(app, platform, calculate_sha256),
+                    tasks
+                ))
+
+            generated_count = sum(results)
+            failed_count = len(apps) - generated_count
+
             logger.info(f"Homebrew formulae: {generated_count} generated, {failed_count} skipped")
             
             # Generate tap info
@@ -836,8 +1247,7 @@ end
                 "formulae_count": generated_count
             }
             
-            with open(self.output_dir / "tap-info.json", 'w', encoding='utf-8') as f:
-                json.dump(tap_info, f, indent=2)
+            write_json(self.output_dir / "tap-info.json", tap_info)
             
             return generated_count > 0
         
@@ -964,16 +1374,18 @@ Examples:
         logger.info("=" * 60)
         
         homebrew_results = []
-        
+
+        # One builder for both platforms so cross-platform apps reuse the
+        # same fetched version lists (and sha cache) across passes.
+        builder = HomebrewBuilder(client, Path(args.homebrew_output))
+
         if args.platform in ['macOS', 'both']:
-            builder = HomebrewBuilder(client, Path(args.homebrew_output))
             homebrew_results.append(builder.build(
                 platform='macOS',
                 calculate_sha256=args.calculate_sha256
             ))
-        
+
         if args.platform in ['Linux', 'both']:
-            builder = HomebrewBuilder(client, Path(args.homebrew_output))
             homebrew_results.append(builder.build(
                 platform='Linux',
                 calculate_sha256=args.calculate_sha256